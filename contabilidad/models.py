@@ -618,7 +618,17 @@ class EmpresaAsiento(models.Model):
             self.motivo_anulacion = motivo
             self.anulado_mediante = contra_asiento
             self.anulado = True
-            self.save()
+            self.save(
+                update_fields=[
+                    "estado",
+                    "anulado_por",
+                    "fecha_anulacion",
+                    "motivo_anulacion",
+                    "anulado_mediante",
+                    "anulado",
+                    "fecha_modificacion",
+                ]
+            )
 
             return contra_asiento
 
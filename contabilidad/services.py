@@ -275,7 +275,7 @@ class AsientoService:
             raise ValidationError("El asiento no tiene líneas de detalle.")
 
         asiento.estado = EstadoAsiento.CONFIRMADO
-        asiento.save()
+        asiento.save(update_fields=["estado", "fecha_modificacion"])
 
     @classmethod
     @transaction.atomic
@@ -521,9 +521,11 @@ class EstadosFinancierosService:
         ) & ~Q(empresatransaccion__asiento_id__in=asientos_cierre_ids)
         
         # Obtener cuentas que tienen transacciones en el periodo (sin cierres)
-        cuentas_ingreso = empresa.cuentas.filter(tipo=TipoCuenta.INGRESO).filter(filtro_periodo).distinct()
-        cuentas_costo = empresa.cuentas.filter(tipo=TipoCuenta.COSTO).filter(filtro_periodo).distinct()
-        cuentas_gasto = empresa.cuentas.filter(tipo=TipoCuenta.GASTO).filter(filtro_periodo).distinct()
+        # Precargar padre y abuelo: _agrupar_por_cuenta_padre recorre get_grupo_principal()
+        cuentas_periodo = empresa.cuentas.filter(filtro_periodo).select_related("padre", "padre__padre")
+        cuentas_ingreso = cuentas_periodo.filter(tipo=TipoCuenta.INGRESO).distinct()
+        cuentas_costo = cuentas_periodo.filter(tipo=TipoCuenta.COSTO).distinct()
+        cuentas_gasto = cuentas_periodo.filter(tipo=TipoCuenta.GASTO).distinct()
 
         # Calcular ingresos (naturaleza acreedora, el haber suma)
         ingresos_detalle = []
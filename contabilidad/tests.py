@@ -1,15 +1,17 @@
-from datetime import date
+from datetime import date, timedelta
 from decimal import Decimal
 
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.test import TestCase
 from django.urls import reverse
+from django.utils import timezone
 
 from .models import (
     Empresa,
     EmpresaAsiento,
     EmpresaPlanCuenta,
+    EstadoAsiento,
     NaturalezaCuenta,
     PeriodoContable,
     TipoCuenta,
@@ -390,3 +392,81 @@ class PlanCuentasHierarchyValidationTests(TestCase):
 
         # nivel_1 tiene nieta (nivel_3) a través de nivel_2
         self.assertFalse(self.nivel_1.puede_recibir_transacciones)
+
+
+class AsientoUpdateFieldsTests(TestCase):
+    """
+    confirmar_asiento y anular guardan con update_fields: verifica que los campos
+    modificados (incluido fecha_modificacion, auto_now) realmente se persisten.
+    """
+
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(username="owner", password="pass")
+        self.empresa = Empresa.objects.create(
+            nombre="Empresa Update Fields", owner=self.user, visible_to_supervisor=True
+        )
+        self.caja = EmpresaPlanCuenta.objects.create(
+            empresa=self.empresa,
+            codigo="1.1.01",
+            descripcion="Caja",
+            tipo=TipoCuenta.ACTIVO,
+            naturaleza=NaturalezaCuenta.DEUDORA,
+            es_auxiliar=True,
+            activa=True,
+        )
+        self.capital = EmpresaPlanCuenta.objects.create(
+            empresa=self.empresa,
+            codigo="3.1",
+            descripcion="Capital",
+            tipo=TipoCuenta.PATRIMONIO,
+            naturaleza=NaturalezaCuenta.ACREEDORA,
+            es_auxiliar=True,
+            activa=True,
+        )
+        self.asiento, _ = AsientoService.crear_asiento(
+            empresa=self.empresa,
+            fecha=date(2025, 1, 1),
+            descripcion="Aporte inicial",
+            lineas=[
+                {
+                    "cuenta_id": self.caja.id,
+                    "detalle": "Aporte",
+                    "debe": Decimal("1000.00"),
+                    "haber": Decimal("0.00"),
+                },
+                {
+                    "cuenta_id": self.capital.id,
+                    "detalle": "Capital",
+                    "debe": Decimal("0.00"),
+                    "haber": Decimal("1000.00"),
+                },
+            ],
+            creado_por=self.user,
+        )
+        # Fecha de modificación antigua para detectar que el guardado la actualiza
+        self.antes = timezone.now() - timedelta(days=1)
+        EmpresaAsiento.objects.filter(pk=self.asiento.pk).update(fecha_modificacion=self.antes)
+
+    def test_confirmar_asiento_persiste_estado_y_fecha_modificacion(self):
+        self.assertEqual(self.asiento.estado, EstadoAsiento.BORRADOR)
+        AsientoService.confirmar_asiento(self.asiento)
+
+        asiento = EmpresaAsiento.objects.get(pk=self.asiento.pk)
+        self.assertEqual(asiento.estado, EstadoAsiento.CONFIRMADO)
+        self.assertGreater(asiento.fecha_modificacion, self.antes)
+
+    def test_anular_asiento_persiste_campos_de_anulacion(self):
+        AsientoService.confirmar_asiento(self.asiento)
+        EmpresaAsiento.objects.filter(pk=self.asiento.pk).update(fecha_modificacion=self.antes)
+
+        contra_asiento = AsientoService.anular_asiento(self.asiento, self.user, "Error de registro")
+
+        asiento = EmpresaAsiento.objects.get(pk=self.asiento.pk)
+        self.assertEqual(asiento.estado, EstadoAsiento.ANULADO)
+        self.assertTrue(asiento.anulado)
+        self.assertEqual(asiento.anulado_por, self.user)
+        self.assertIsNotNone(asiento.fecha_anulacion)
+        self.assertEqual(asiento.motivo_anulacion, "Error de registro")
+        self.assertEqual(asiento.anulado_mediante, contra_asiento)
+        self.assertGreater(asiento.fecha_modificacion, self.antes)
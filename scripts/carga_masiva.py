@@ -0,0 +1,61 @@
+"""
+Utilidades de carga masiva de asientos compartidas por los scripts de datos de ejemplo.
+
+Debe importarse después de django.setup().
+"""
+
+from django.db import connection
+from django.db.models import Max
+from django.utils import timezone
+
+from contabilidad.models import EmpresaAsiento, EmpresaTransaccion
+
+
+def siguiente_numero_asiento(empresa):
+    """Primer numero_asiento libre de la empresa para asientos creados con bulk_create.
+
+    bulk_create no pasa por EmpresaAsiento.save(), que es quien numera; se replica su
+    criterio (máximo + 1, no count(), por si hay huecos). Los asientos siguientes del
+    lote se numeran consecutivamente a partir de este valor.
+    """
+    ultimo = EmpresaAsiento.objects.filter(empresa=empresa).aggregate(Max("numero_asiento"))[
+        "numero_asiento__max"
+    ]
+    return (ultimo or 0) + 1
+
+
+def insertar_transacciones(filas, campos, rapido=False, batch_size=1000):
+    """Inserta líneas de EmpresaTransaccion dadas como tuplas con los valores de `campos`.
+
+    `campos` son nombres de atributo del modelo (p. ej. "asiento_id", "debe").
+    Por defecto usa bulk_create. Con `rapido` y MariaDB/MySQL las filas se envían
+    con `executemany` sobre un INSERT construido a partir de los metadatos del
+    modelo (mysqlclient lo agrupa en sentencias multi-fila), sin instanciar
+    modelos. Ninguno de los dos caminos dispara señales: solo cambia cómo se
+    arma la sentencia.
+    """
+    if not rapido or connection.vendor != "mysql":
+        EmpresaTransaccion.objects.bulk_create(
+            [EmpresaTransaccion(**dict(zip(campos, fila, strict=True))) for fila in filas],
+            batch_size=batch_size,
+        )
+        return
+
+    opts = EmpresaTransaccion._meta
+    fields = [opts.get_field(campo) for campo in campos]
+    # El SQL directo omite auto_now_add: la fecha de creación se fija aquí
+    fecha_creacion = opts.get_field("fecha_creacion")
+    ahora = fecha_creacion.get_db_prep_save(timezone.now(), connection)
+
+    columnas = ", ".join(connection.ops.quote_name(f.column) for f in [*fields, fecha_creacion])
+    marcadores = ", ".join(["%s"] * (len(fields) + 1))
+    sql = (
+        f"INSERT INTO {connection.ops.quote_name(opts.db_table)} ({columnas}) "
+        f"VALUES ({marcadores})"
+    )
+    valores = [
+        [f.get_db_prep_save(v, connection) for f, v in zip(fields, fila, strict=True)] + [ahora]
+        for fila in filas
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, valores)
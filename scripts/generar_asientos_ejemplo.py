@@ -2,6 +2,12 @@
 """
 Script para generar asientos contables de ejemplo que permitan
 visualizar correctamente el dashboard ML/AI.
+
+Opciones:
+  --fast       Inserta las líneas con un INSERT directo en lugar de bulk_create.
+
+Variables de entorno:
+  ENCI_BULK_BATCH_SIZE  Filas por lote en bulk_create (por defecto 1000).
 """
 
 import os
@@ -11,259 +17,207 @@ from decimal import Decimal
 from datetime import date, timedelta
 
 # Configurar Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 django.setup()
 
 from contabilidad.models import (
-    Empresa, EmpresaAsiento, EmpresaTransaccion, 
+    Empresa, EmpresaAsiento,
     EmpresaPlanCuenta, EstadoAsiento
 )
 from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from scripts.carga_masiva import insertar_transacciones, siguiente_numero_asiento
 
 User = get_user_model()
 
-def crear_asientos_ejemplo():
-    """Crea asientos de ejemplo para demostrar el dashboard ML/AI."""
+BATCH_SIZE = int(os.environ.get('ENCI_BULK_BATCH_SIZE', '1000'))
+
+ZERO = Decimal('0.00')
+PASIVOS_ANTERIORES = 1750_00  # centavos
+
+# (días desde fecha base, descripción, resumen, [(cuenta, detalle, debe, haber), ...])
+# Los montos están en centavos (int) y se convierten a Decimal solo al crear las filas.
+ASIENTOS_SPEC = [
+    (0, "Apertura - Capital inicial en efectivo", "Apertura: $50,000", [
+        ('activo', "Efectivo inicial", 50000_00, 0),
+        ('patrimonio', "Capital social", 0, 50000_00),
+    ]),
+    (2, "Venta de servicios de consultoría", "Venta servicios: $15,000", [
+        ('activo', "Cobro servicios consultoría", 15000_00, 0),
+        ('ingreso', "Ingreso por servicios", 0, 15000_00),
+    ]),
+    (5, "Pago de gastos administrativos", "Gastos operativos: $3,500", [
+        ('gasto', "Gastos de oficina y suministros", 3500_00, 0),
+        ('activo', "Pago en efectivo", 0, 3500_00),
+    ]),
+    (7, "Compra de materiales e insumos", "Costos materiales: $5,000", [
+        ('costo', "Materiales para proyectos", 5000_00, 0),
+        ('activo', "Pago materiales", 0, 5000_00),
+    ]),
+    (10, "Préstamo bancario a corto plazo", "Préstamo bancario: $20,000", [
+        ('activo', "Efectivo recibido del banco", 20000_00, 0),
+        ('pasivo', "Préstamo bancario", 0, 20000_00),
+    ]),
+    (12, "Venta de servicios profesionales", "Venta servicios: $12,000", [
+        ('activo', "Cobro servicios profesionales", 12000_00, 0),
+        ('ingreso', "Servicios profesionales", 0, 12000_00),
+    ]),
+]
+
+
+def _monto(centavos):
+    """Convierte un monto en centavos de la especificación a Decimal con dos decimales."""
+    return Decimal(centavos).scaleb(-2) if centavos else ZERO
+
+def crear_asientos_ejemplo(out, rapido=False):
+    """Crea asientos de ejemplo para demostrar el dashboard ML/AI.
+
+    Los mensajes de progreso se acumulan en `out` y se escriben de una vez al final.
+    """
     
     # Obtener empresa y usuario
-    empresa = Empresa.objects.get(pk=1)
-    usuario = User.objects.get(username='elikat')
-    
-    print("=" * 70)
-    print(f"GENERANDO ASIENTOS DE EJEMPLO PARA: {empresa.nombre}")
-    print("=" * 70)
+    empresa = Empresa.objects.only('pk', 'nombre').get(pk=1)
+    usuario_id = User.objects.filter(username='elikat').values_list('pk', flat=True).first()
+    if usuario_id is None:
+        out.append("\n⚠️  ADVERTENCIA: No existe el usuario 'elikat'")
+        return
     
-    # Verificar cuentas necesarias (deben ser AUXILIARES)
-    cuentas = {
-        'activo': EmpresaPlanCuenta.objects.filter(empresa=empresa, tipo='Activo', es_auxiliar=True).first(),
-        'pasivo': EmpresaPlanCuenta.objects.filter(empresa=empresa, tipo='Pasivo', es_auxiliar=True).first(),
-        'patrimonio': EmpresaPlanCuenta.objects.filter(empresa=empresa, tipo='Patrimonio', es_auxiliar=True).first(),
-        'ingreso': EmpresaPlanCuenta.objects.filter(empresa=empresa, tipo='Ingreso', es_auxiliar=True).first(),
-        'gasto': EmpresaPlanCuenta.objects.filter(empresa=empresa, tipo='Gasto', es_auxiliar=True).first(),
-        'costo': EmpresaPlanCuenta.objects.filter(empresa=empresa, tipo='Costo', es_auxiliar=True).first(),
-    }
+    out.append("=" * 70)
+    out.append(f"GENERANDO ASIENTOS DE EJEMPLO PARA: {empresa.nombre}")
+    out.append("=" * 70)
     
-    # Verificar que existen todas las cuentas
-    faltantes = [k for k, v in cuentas.items() if v is None]
+    # Verificar cuentas necesarias (deben ser AUXILIARES) con una consulta ligera
+    # sobre el índice antes de cargar ninguna fila completa
+    tipos = ['Activo', 'Pasivo', 'Patrimonio', 'Ingreso', 'Gasto', 'Costo']
+    auxiliares = EmpresaPlanCuenta.objects.filter(
+        empresa=empresa, es_auxiliar=True, tipo__in=tipos
+    )
+    presentes = set(auxiliares.order_by().values_list('tipo', flat=True).distinct())
+    faltantes = [tipo.lower() for tipo in tipos if tipo not in presentes]
     if faltantes:
-        print(f"\n⚠️  ADVERTENCIA: Faltan cuentas: {', '.join(faltantes)}")
+        out.append(f"\n⚠️  ADVERTENCIA: Faltan cuentas: {', '.join(faltantes)}")
         return
-    
-    print("\n✓ Cuentas disponibles:")
+
+    # Nos quedamos con la primera cuenta (por código) de cada tipo
+    por_tipo = {}
+    for cuenta in auxiliares.order_by('tipo', 'codigo').only(
+        'pk', 'codigo', 'descripcion', 'tipo', 'es_auxiliar'
+    ):
+        por_tipo.setdefault(cuenta.tipo, cuenta)
+    cuentas = {tipo.lower(): por_tipo[tipo] for tipo in tipos}
+    
+    out.append("\n✓ Cuentas disponibles:")
     for tipo, cuenta in cuentas.items():
-        print(f"  - {tipo.capitalize():12s}: {cuenta.codigo} - {cuenta.descripcion}")
+        out.append(f"  - {tipo.capitalize():12s}: {cuenta.codigo} - {cuenta.descripcion}")
     
+    # Omitir los asientos que ya se generaron en una ejecución anterior
+    existentes = set(EmpresaAsiento.objects.filter(
+        empresa=empresa,
+        descripcion_general__in=[spec[1] for spec in ASIENTOS_SPEC]
+    ).values_list('descripcion_general', flat=True))
+    pendientes = [spec for spec in ASIENTOS_SPEC if spec[1] not in existentes]
+    if not pendientes:
+        out.append("\n✓ Los asientos de ejemplo ya existen, no hay nada que crear.")
+        return
+
     # Fecha base
     fecha_base = date.today() - timedelta(days=15)
-    
-    asientos_creados = []
-    
-    # 1. Asiento de Apertura (Capital inicial)
-    print("\n1️⃣  Creando asiento de apertura (Capital inicial)...")
-    asiento1 = EmpresaAsiento.objects.create(
-        empresa=empresa,
-        fecha=fecha_base,
-        descripcion_general="Apertura - Capital inicial en efectivo",
-        estado=EstadoAsiento.CONFIRMADO,
-        creado_por=usuario
-    )
-    EmpresaTransaccion.objects.create(
-        asiento=asiento1,
-        cuenta=cuentas['activo'],  # Efectivo/Caja
-        detalle_linea="Efectivo inicial",
-        debe=Decimal('50000.00'),
-        haber=Decimal('0.00'),
-        creado_por=usuario
-    )
-    EmpresaTransaccion.objects.create(
-        asiento=asiento1,
-        cuenta=cuentas['patrimonio'],  # Capital
-        detalle_linea="Capital social",
-        debe=Decimal('0.00'),
-        haber=Decimal('50000.00'),
-        creado_por=usuario
-    )
-    asientos_creados.append(f"#{asiento1.numero_asiento} - Apertura: $50,000")
-    
-    # 2. Venta de servicios (Ingreso)
-    print("2️⃣  Creando asiento de venta de servicios...")
-    asiento2 = EmpresaAsiento.objects.create(
-        empresa=empresa,
-        fecha=fecha_base + timedelta(days=2),
-        descripcion_general="Venta de servicios de consultoría",
-        estado=EstadoAsiento.CONFIRMADO,
-        creado_por=usuario
-    )
-    EmpresaTransaccion.objects.create(
-        asiento=asiento2,
-        cuenta=cuentas['activo'],
-        detalle_linea="Cobro servicios consultoría",
-        debe=Decimal('15000.00'),
-        haber=Decimal('0.00'),
-        creado_por=usuario
-    )
-    EmpresaTransaccion.objects.create(
-        asiento=asiento2,
-        cuenta=cuentas['ingreso'],
-        detalle_linea="Ingreso por servicios",
-        debe=Decimal('0.00'),
-        haber=Decimal('15000.00'),
-        creado_por=usuario
-    )
-    asientos_creados.append(f"#{asiento2.numero_asiento} - Venta servicios: $15,000")
-    
-    # 3. Pago de gastos operativos
-    print("3️⃣  Creando asiento de gastos operativos...")
-    asiento3 = EmpresaAsiento.objects.create(
-        empresa=empresa,
-        fecha=fecha_base + timedelta(days=5),
-        descripcion_general="Pago de gastos administrativos",
-        estado=EstadoAsiento.CONFIRMADO,
-        creado_por=usuario
-    )
-    EmpresaTransaccion.objects.create(
-        asiento=asiento3,
-        cuenta=cuentas['gasto'],
-        detalle_linea="Gastos de oficina y suministros",
-        debe=Decimal('3500.00'),
-        haber=Decimal('0.00'),
-        creado_por=usuario
-    )
-    EmpresaTransaccion.objects.create(
-        asiento=asiento3,
-        cuenta=cuentas['activo'],
-        detalle_linea="Pago en efectivo",
-        debe=Decimal('0.00'),
-        haber=Decimal('3500.00'),
-        creado_por=usuario
-    )
-    asientos_creados.append(f"#{asiento3.numero_asiento} - Gastos operativos: $3,500")
-    
-    # 4. Compra de insumos (Costo)
-    print("4️⃣  Creando asiento de costos...")
-    asiento4 = EmpresaAsiento.objects.create(
-        empresa=empresa,
-        fecha=fecha_base + timedelta(days=7),
-        descripcion_general="Compra de materiales e insumos",
-        estado=EstadoAsiento.CONFIRMADO,
-        creado_por=usuario
-    )
-    EmpresaTransaccion.objects.create(
-        asiento=asiento4,
-        cuenta=cuentas['costo'],
-        detalle_linea="Materiales para proyectos",
-        debe=Decimal('5000.00'),
-        haber=Decimal('0.00'),
-        creado_por=usuario
-    )
-    EmpresaTransaccion.objects.create(
-        asiento=asiento4,
-        cuenta=cuentas['activo'],
-        detalle_linea="Pago materiales",
-        debe=Decimal('0.00'),
-        haber=Decimal('5000.00'),
-        creado_por=usuario
-    )
-    asientos_creados.append(f"#{asiento4.numero_asiento} - Costos materiales: $5,000")
-    
-    # 5. Préstamo bancario (Pasivo)
-    print("5️⃣  Creando asiento de préstamo bancario...")
-    asiento5 = EmpresaAsiento.objects.create(
-        empresa=empresa,
-        fecha=fecha_base + timedelta(days=10),
-        descripcion_general="Préstamo bancario a corto plazo",
-        estado=EstadoAsiento.CONFIRMADO,
-        creado_por=usuario
-    )
-    EmpresaTransaccion.objects.create(
-        asiento=asiento5,
-        cuenta=cuentas['activo'],
-        detalle_linea="Efectivo recibido del banco",
-        debe=Decimal('20000.00'),
-        haber=Decimal('0.00'),
-        creado_por=usuario
-    )
-    EmpresaTransaccion.objects.create(
-        asiento=asiento5,
-        cuenta=cuentas['pasivo'],
-        detalle_linea="Préstamo bancario",
-        debe=Decimal('0.00'),
-        haber=Decimal('20000.00'),
-        creado_por=usuario
-    )
-    asientos_creados.append(f"#{asiento5.numero_asiento} - Préstamo bancario: $20,000")
-    
-    # 6. Segunda venta (más ingresos)
-    print("6️⃣  Creando segundo asiento de ventas...")
-    asiento6 = EmpresaAsiento.objects.create(
-        empresa=empresa,
-        fecha=fecha_base + timedelta(days=12),
-        descripcion_general="Venta de servicios profesionales",
-        estado=EstadoAsiento.CONFIRMADO,
-        creado_por=usuario
-    )
-    EmpresaTransaccion.objects.create(
-        asiento=asiento6,
-        cuenta=cuentas['activo'],
-        detalle_linea="Cobro servicios profesionales",
-        debe=Decimal('12000.00'),
-        haber=Decimal('0.00'),
-        creado_por=usuario
-    )
-    EmpresaTransaccion.objects.create(
-        asiento=asiento6,
-        cuenta=cuentas['ingreso'],
-        detalle_linea="Servicios profesionales",
-        debe=Decimal('0.00'),
-        haber=Decimal('12000.00'),
-        creado_por=usuario
-    )
-    asientos_creados.append(f"#{asiento6.numero_asiento} - Venta servicios: $12,000")
-    
-    print("\n" + "=" * 70)
-    print("✅ ASIENTOS CREADOS EXITOSAMENTE")
-    print("=" * 70)
+
+    primero = siguiente_numero_asiento(empresa)
+
+    cuentas_ids = {clave: cuenta.pk for clave, cuenta in cuentas.items()}
+
+    cabeceras = []
+    lineas_por_asiento = []
+    for i, (offset, descripcion, _resumen, lineas) in enumerate(pendientes):
+        cabeceras.append(EmpresaAsiento(
+            empresa_id=empresa.pk,
+            numero_asiento=primero + i,
+            fecha=fecha_base + timedelta(days=offset),
+            descripcion_general=descripcion,
+            estado=EstadoAsiento.CONFIRMADO,
+            creado_por_id=usuario_id
+        ))
+        lineas_por_asiento.append([
+            (cuentas_ids[clave], detalle, _monto(debe), _monto(haber))
+            for clave, detalle, debe, haber in lineas
+        ])
+
+    out.append(f"\nCreando {len(cabeceras)} asientos de ejemplo...")
+    with transaction.atomic():
+        cabeceras = EmpresaAsiento.objects.bulk_create(cabeceras, batch_size=BATCH_SIZE)
+        insertar_transacciones(
+            [
+                (asiento.pk, cuenta_id, detalle, debe, haber, usuario_id)
+                for asiento, lineas in zip(cabeceras, lineas_por_asiento, strict=True)
+                for cuenta_id, detalle, debe, haber in lineas
+            ],
+            ('asiento_id', 'cuenta_id', 'detalle_linea', 'debe', 'haber', 'creado_por_id'),
+            rapido=rapido,
+            batch_size=BATCH_SIZE,
+        )
+
+    asientos_creados = [
+        f"#{asiento.numero_asiento} - {spec[2]}"
+        for asiento, spec in zip(cabeceras, pendientes, strict=True)
+    ]
+    
+    out.append("\n" + "=" * 70)
+    out.append("✅ ASIENTOS CREADOS EXITOSAMENTE")
+    out.append("=" * 70)
     for asiento in asientos_creados:
-        print(f"  ✓ {asiento}")
+        out.append(f"  ✓ {asiento}")
     
     # Calcular totales
-    print("\n" + "=" * 70)
-    print("RESUMEN FINANCIERO")
-    print("=" * 70)
-    
-    total_ingresos = Decimal('15000.00') + Decimal('12000.00')
-    total_gastos = Decimal('3500.00')
-    total_costos = Decimal('5000.00')
+    out.append("\n" + "=" * 70)
+    out.append("RESUMEN FINANCIERO")
+    out.append("=" * 70)
+    
+    # Saldo (debe - haber) por cuenta, en una sola pasada sobre la especificación
+    saldos = {}
+    for _offset, _descripcion, _resumen, lineas in ASIENTOS_SPEC:
+        for clave, _detalle, debe, haber in lineas:
+            saldos[clave] = saldos.get(clave, 0) + debe - haber
+
+    total_ingresos = -saldos.get('ingreso', 0)
+    total_gastos = saldos.get('gasto', 0)
+    total_costos = saldos.get('costo', 0)
     utilidad = total_ingresos - total_gastos - total_costos
     
-    print(f"  Ingresos totales:  ${total_ingresos:,.2f}")
-    print(f"  Gastos totales:    ${total_gastos:,.2f}")
-    print(f"  Costos totales:    ${total_costos:,.2f}")
-    print(f"  Utilidad neta:     ${utilidad:,.2f}")
+    out.append(f"  Ingresos totales:  ${total_ingresos / 100:,.2f}")
+    out.append(f"  Gastos totales:    ${total_gastos / 100:,.2f}")
+    out.append(f"  Costos totales:    ${total_costos / 100:,.2f}")
+    out.append(f"  Utilidad neta:     ${utilidad / 100:,.2f}")
     
     # Activos y pasivos (simplificado)
-    saldo_efectivo = Decimal('50000.00') + Decimal('15000.00') - Decimal('3500.00') - Decimal('5000.00') + Decimal('20000.00') + Decimal('12000.00')
-    total_pasivos = Decimal('20000.00') + Decimal('1750.00')  # Préstamo + pasivos anteriores
-    
-    print(f"\n  Efectivo/Activos:  ${saldo_efectivo:,.2f}")
-    print(f"  Pasivos totales:   ${total_pasivos:,.2f}")
-    
-    print("\n" + "=" * 70)
-    print("📊 Ahora recarga: http://127.0.0.1:8000/contabilidad/1/ml-dashboard/")
-    print("=" * 70)
-    print("\nEl dashboard ahora mostrará:")
-    print("  ✓ Razón Corriente (Liquidez)")
-    print("  ✓ ROA (Rentabilidad sobre Activos)")
-    print("  ✓ Razón de Endeudamiento")
-    print("  ✓ Margen Neto")
-    print("  ✓ Gráficos radar y barras con datos reales")
-    print("  ✓ Insights automáticos basados en IA")
+    saldo_efectivo = saldos.get('activo', 0)
+    total_pasivos = -saldos.get('pasivo', 0) + PASIVOS_ANTERIORES  # Préstamo + pasivos anteriores
+    
+    out.append(f"\n  Efectivo/Activos:  ${saldo_efectivo / 100:,.2f}")
+    out.append(f"  Pasivos totales:   ${total_pasivos / 100:,.2f}")
+    
+    out.append("\n" + "=" * 70)
+    out.append("📊 Ahora recarga: http://127.0.0.1:8000/contabilidad/1/ml-dashboard/")
+    out.append("=" * 70)
+    out.append("\nEl dashboard ahora mostrará:")
+    out.append("  ✓ Razón Corriente (Liquidez)")
+    out.append("  ✓ ROA (Rentabilidad sobre Activos)")
+    out.append("  ✓ Razón de Endeudamiento")
+    out.append("  ✓ Margen Neto")
+    out.append("  ✓ Gráficos radar y barras con datos reales")
+    out.append("  ✓ Insights automáticos basados en IA")
 
 if __name__ == "__main__":
+    salida = []
     try:
-        crear_asientos_ejemplo()
+        crear_asientos_ejemplo(salida, rapido='--fast' in sys.argv[1:])
     except Exception as e:
-        print(f"\n❌ ERROR: {e}")
+        salida.append(f"\n❌ ERROR: {e}")
+        sys.stdout.write("\n".join(salida) + "\n")
+        sys.stdout.flush()
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    sys.stdout.write("\n".join(salida) + "\n")
@@ -6,15 +6,21 @@ Genera un plan de cuentas completo y asientos contables históricos.
 
 Ejecutar con: python manage.py shell < scripts/generar_datos_ml_prueba.py
 O: uv run python manage.py shell < scripts/generar_datos_ml_prueba.py
+
+Si la empresa ya tiene los datos generados el script termina sin hacer nada;
+para regenerarlos igualmente usar FORCE=1 (o --force al ejecutarlo directamente).
+Con FAST=1 (o --fast) las líneas se insertan con un INSERT directo en lugar de bulk_create.
 """
 
 import os
 import sys
+from collections import Counter
 from datetime import date, timedelta
 from decimal import Decimal
-from random import choice, randint
+from random import choice
 
 import django
+import numpy as np
 
 # Setup Django
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -22,6 +28,8 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 django.setup()
 
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from scripts.carga_masiva import insertar_transacciones, siguiente_numero_asiento
 
 from contabilidad.models import (
     Empresa,
@@ -40,6 +48,319 @@ User = get_user_model()
 EMPRESA_ID = 1  # Empresa de aleela
 NUM_ASIENTOS = 60  # Número de asientos a generar
 MESES_HISTORIA = 12  # Meses de historia
+FORCE = os.environ.get("FORCE") == "1" or "--force" in sys.argv[1:]  # Regenerar aunque existan
+FAST = os.environ.get("FAST") == "1" or "--fast" in sys.argv[1:]  # INSERT directo de líneas
+
+
+# Estructura del plan de cuentas que crea crear_plan_cuentas_completo
+PLAN_CUENTAS = [
+    # ACTIVOS (1)
+    {
+        "codigo": "1",
+        "descripcion": "ACTIVO",
+        "tipo": TipoCuenta.ACTIVO,
+        "naturaleza": NaturalezaCuenta.DEUDORA,
+        "es_auxiliar": False,
+    },
+    {
+        "codigo": "1.1",
+        "descripcion": "ACTIVO CORRIENTE",
+        "tipo": TipoCuenta.ACTIVO,
+        "naturaleza": NaturalezaCuenta.DEUDORA,
+        "es_auxiliar": False,
+    },
+    {
+        "codigo": "1.1.01",
+        "descripcion": "CAJA",
+        "tipo": TipoCuenta.ACTIVO,
+        "naturaleza": NaturalezaCuenta.DEUDORA,
+        "es_auxiliar": True,
+    },
+    {
+        "codigo": "1.1.02",
+        "descripcion": "BANCOS",
+        "tipo": TipoCuenta.ACTIVO,
+        "naturaleza": NaturalezaCuenta.DEUDORA,
+        "es_auxiliar": True,
+    },
+    {
+        "codigo": "1.1.03",
+        "descripcion": "CUENTAS POR COBRAR CLIENTES",
+        "tipo": TipoCuenta.ACTIVO,
+        "naturaleza": NaturalezaCuenta.DEUDORA,
+        "es_auxiliar": True,
+    },
+    {
+        "codigo": "1.1.04",
+        "descripcion": "INVENTARIOS",
+        "tipo": TipoCuenta.ACTIVO,
+        "naturaleza": NaturalezaCuenta.DEUDORA,
+        "es_auxiliar": True,
+    },
+    {
+        "codigo": "1.2",
+        "descripcion": "ACTIVO NO CORRIENTE",
+        "tipo": TipoCuenta.ACTIVO,
+        "naturaleza": NaturalezaCuenta.DEUDORA,
+        "es_auxiliar": False,
+    },
+    {
+        "codigo": "1.2.01",
+        "descripcion": "MUEBLES Y ENSERES",
+        "tipo": TipoCuenta.ACTIVO,
+        "naturaleza": NaturalezaCuenta.DEUDORA,
+        "es_auxiliar": True,
+    },
+    {
+        "codigo": "1.2.02",
+        "descripcion": "EQUIPOS DE OFICINA",
+        "tipo": TipoCuenta.ACTIVO,
+        "naturaleza": NaturalezaCuenta.DEUDORA,
+        "es_auxiliar": True,
+    },
+    {
+        "codigo": "1.2.03",
+        "descripcion": "EQUIPOS DE CÓMPUTO",
+        "tipo": TipoCuenta.ACTIVO,
+        "naturaleza": NaturalezaCuenta.DEUDORA,
+        "es_auxiliar": True,
+    },
+    {
+        "codigo": "1.2.04",
+        "descripcion": "VEHÍCULOS",
+        "tipo": TipoCuenta.ACTIVO,
+        "naturaleza": NaturalezaCuenta.DEUDORA,
+        "es_auxiliar": True,
+    },
+    # PASIVOS (2)
+    {
+        "codigo": "2",
+        "descripcion": "PASIVO",
+        "tipo": TipoCuenta.PASIVO,
+        "naturaleza": NaturalezaCuenta.ACREEDORA,
+        "es_auxiliar": False,
+    },
+    {
+        "codigo": "2.1",
+        "descripcion": "PASIVO CORRIENTE",
+        "tipo": TipoCuenta.PASIVO,
+        "naturaleza": NaturalezaCuenta.ACREEDORA,
+        "es_auxiliar": False,
+    },
+    {
+        "codigo": "2.1.01",
+        "descripcion": "CUENTAS POR PAGAR PROVEEDORES",
+        "tipo": TipoCuenta.PASIVO,
+        "naturaleza": NaturalezaCuenta.ACREEDORA,
+        "es_auxiliar": True,
+    },
+    {
+        "codigo": "2.1.02",
+        "descripcion": "IMPUESTOS POR PAGAR",
+        "tipo": TipoCuenta.PASIVO,
+        "naturaleza": NaturalezaCuenta.ACREEDORA,
+        "es_auxiliar": True,
+    },
+    {
+        "codigo": "2.1.03",
+        "descripcion": "SALARIOS POR PAGAR",
+        "tipo": TipoCuenta.PASIVO,
+        "naturaleza": NaturalezaCuenta.ACREEDORA,
+        "es_auxiliar": True,
+    },
+    {
+        "codigo": "2.2",
+        "descripcion": "PASIVO NO CORRIENTE",
+        "tipo": TipoCuenta.PASIVO,
+        "naturaleza": NaturalezaCuenta.ACREEDORA,
+        "es_auxiliar": False,
+    },
+    {
+        "codigo": "2.2.01",
+        "descripcion": "PRÉSTAMOS BANCARIOS LARGO PLAZO",
+        "tipo": TipoCuenta.PASIVO,
+        "naturaleza": NaturalezaCuenta.ACREEDORA,
+        "es_auxiliar": True,
+    },
+    # PATRIMONIO (3)
+    {
+        "codigo": "3",
+        "descripcion": "PATRIMONIO",
+        "tipo": TipoCuenta.PATRIMONIO,
+        "naturaleza": NaturalezaCuenta.ACREEDORA,
+        "es_auxiliar": False,
+    },
+    {
+        "codigo": "3.1",
+        "descripcion": "CAPITAL",
+        "tipo": TipoCuenta.PATRIMONIO,
+        "naturaleza": NaturalezaCuenta.ACREEDORA,
+        "es_auxiliar": False,
+    },
+    {
+        "codigo": "3.1.01",
+        "descripcion": "CAPITAL SOCIAL",
+        "tipo": TipoCuenta.PATRIMONIO,
+        "naturaleza": NaturalezaCuenta.ACREEDORA,
+        "es_auxiliar": True,
+    },
+    {
+        "codigo": "3.2",
+        "descripcion": "RESULTADOS",
+        "tipo": TipoCuenta.PATRIMONIO,
+        "naturaleza": NaturalezaCuenta.ACREEDORA,
+        "es_auxiliar": False,
+    },
+    {
+        "codigo": "3.2.01",
+        "descripcion": "UTILIDADES RETENIDAS",
+        "tipo": TipoCuenta.PATRIMONIO,
+        "naturaleza": NaturalezaCuenta.ACREEDORA,
+        "es_auxiliar": True,
+    },
+    {
+        "codigo": "3.2.02",
+        "descripcion": "UTILIDAD DEL EJERCICIO",
+        "tipo": TipoCuenta.PATRIMONIO,
+        "naturaleza": NaturalezaCuenta.ACREEDORA,
+        "es_auxiliar": True,
+    },
+    # INGRESOS (4)
+    {
+        "codigo": "4",
+        "descripcion": "INGRESOS",
+        "tipo": TipoCuenta.INGRESO,
+        "naturaleza": NaturalezaCuenta.ACREEDORA,
+        "es_auxiliar": False,
+    },
+    {
+        "codigo": "4.1",
+        "descripcion": "INGRESOS OPERACIONALES",
+        "tipo": TipoCuenta.INGRESO,
+        "naturaleza": NaturalezaCuenta.ACREEDORA,
+        "es_auxiliar": False,
+    },
+    {
+        "codigo": "4.1.01",
+        "descripcion": "VENTAS DE PRODUCTOS",
+        "tipo": TipoCuenta.INGRESO,
+        "naturaleza": NaturalezaCuenta.ACREEDORA,
+        "es_auxiliar": True,
+    },
+    {
+        "codigo": "4.1.02",
+        "descripcion": "PRESTACIÓN DE SERVICIOS",
+        "tipo": TipoCuenta.INGRESO,
+        "naturaleza": NaturalezaCuenta.ACREEDORA,
+        "es_auxiliar": True,
+    },
+    {
+        "codigo": "4.2",
+        "descripcion": "INGRESOS NO OPERACIONALES",
+        "tipo": TipoCuenta.INGRESO,
+        "naturaleza": NaturalezaCuenta.ACREEDORA,
+        "es_auxiliar": False,
+    },
+    {
+        "codigo": "4.2.01",
+        "descripcion": "INTERESES GANADOS",
+        "tipo": TipoCuenta.INGRESO,
+        "naturaleza": NaturalezaCuenta.ACREEDORA,
+        "es_auxiliar": True,
+    },
+    # GASTOS (5)
+    {
+        "codigo": "5",
+        "descripcion": "GASTOS",
+        "tipo": TipoCuenta.GASTO,
+        "naturaleza": NaturalezaCuenta.DEUDORA,
+        "es_auxiliar": False,
+    },
+    {
+        "codigo": "5.1",
+        "descripcion": "COSTO DE VENTAS",
+        "tipo": TipoCuenta.GASTO,
+        "naturaleza": NaturalezaCuenta.DEUDORA,
+        "es_auxiliar": False,
+    },
+    {
+        "codigo": "5.1.01",
+        "descripcion": "COSTO DE PRODUCTOS VENDIDOS",
+        "tipo": TipoCuenta.GASTO,
+        "naturaleza": NaturalezaCuenta.DEUDORA,
+        "es_auxiliar": True,
+    },
+    {
+        "codigo": "5.2",
+        "descripcion": "GASTOS ADMINISTRATIVOS",
+        "tipo": TipoCuenta.GASTO,
+        "naturaleza": NaturalezaCuenta.DEUDORA,
+        "es_auxiliar": False,
+    },
+    {
+        "codigo": "5.2.01",
+        "descripcion": "SUELDOS Y SALARIOS",
+        "tipo": TipoCuenta.GASTO,
+        "naturaleza": NaturalezaCuenta.DEUDORA,
+        "es_auxiliar": True,
+    },
+    {
+        "codigo": "5.2.02",
+        "descripcion": "ARRIENDO",
+        "tipo": TipoCuenta.GASTO,
+        "naturaleza": NaturalezaCuenta.DEUDORA,
+        "es_auxiliar": True,
+    },
+    {
+        "codigo": "5.2.03",
+        "descripcion": "SERVICIOS PÚBLICOS",
+        "tipo": TipoCuenta.GASTO,
+        "naturaleza": NaturalezaCuenta.DEUDORA,
+        "es_auxiliar": True,
+    },
+    {
+        "codigo": "5.2.04",
+        "descripcion": "ÚTILES Y PAPELERÍA",
+        "tipo": TipoCuenta.GASTO,
+        "naturaleza": NaturalezaCuenta.DEUDORA,
+        "es_auxiliar": True,
+    },
+    {
+        "codigo": "5.3",
+        "descripcion": "GASTOS DE VENTAS",
+        "tipo": TipoCuenta.GASTO,
+        "naturaleza": NaturalezaCuenta.DEUDORA,
+        "es_auxiliar": False,
+    },
+    {
+        "codigo": "5.3.01",
+        "descripcion": "COMISIONES DE VENTAS",
+        "tipo": TipoCuenta.GASTO,
+        "naturaleza": NaturalezaCuenta.DEUDORA,
+        "es_auxiliar": True,
+    },
+    {
+        "codigo": "5.3.02",
+        "descripcion": "PUBLICIDAD Y MARKETING",
+        "tipo": TipoCuenta.GASTO,
+        "naturaleza": NaturalezaCuenta.DEUDORA,
+        "es_auxiliar": True,
+    },
+    {
+        "codigo": "5.4",
+        "descripcion": "GASTOS FINANCIEROS",
+        "tipo": TipoCuenta.GASTO,
+        "naturaleza": NaturalezaCuenta.DEUDORA,
+        "es_auxiliar": False,
+    },
+    {
+        "codigo": "5.4.01",
+        "descripcion": "INTERESES PAGADOS",
+        "tipo": TipoCuenta.GASTO,
+        "naturaleza": NaturalezaCuenta.DEUDORA,
+        "es_auxiliar": True,
+    },
+]
 
 
 def print_step(msg):
@@ -53,334 +374,35 @@ def crear_plan_cuentas_completo(empresa):
     """Crea un plan de cuentas completo para la empresa."""
     print_step("📊 CREANDO PLAN DE CUENTAS COMPLETO")
 
-    # Estructura del plan de cuentas
-    cuentas = [
-        # ACTIVOS (1)
-        {
-            "codigo": "1",
-            "descripcion": "ACTIVO",
-            "tipo": TipoCuenta.ACTIVO,
-            "naturaleza": NaturalezaCuenta.DEUDORA,
-            "es_auxiliar": False,
-        },
-        {
-            "codigo": "1.1",
-            "descripcion": "ACTIVO CORRIENTE",
-            "tipo": TipoCuenta.ACTIVO,
-            "naturaleza": NaturalezaCuenta.DEUDORA,
-            "es_auxiliar": False,
-        },
-        {
-            "codigo": "1.1.01",
-            "descripcion": "CAJA",
-            "tipo": TipoCuenta.ACTIVO,
-            "naturaleza": NaturalezaCuenta.DEUDORA,
-            "es_auxiliar": True,
-        },
-        {
-            "codigo": "1.1.02",
-            "descripcion": "BANCOS",
-            "tipo": TipoCuenta.ACTIVO,
-            "naturaleza": NaturalezaCuenta.DEUDORA,
-            "es_auxiliar": True,
-        },
-        {
-            "codigo": "1.1.03",
-            "descripcion": "CUENTAS POR COBRAR CLIENTES",
-            "tipo": TipoCuenta.ACTIVO,
-            "naturaleza": NaturalezaCuenta.DEUDORA,
-            "es_auxiliar": True,
-        },
-        {
-            "codigo": "1.1.04",
-            "descripcion": "INVENTARIOS",
-            "tipo": TipoCuenta.ACTIVO,
-            "naturaleza": NaturalezaCuenta.DEUDORA,
-            "es_auxiliar": True,
-        },
-        {
-            "codigo": "1.2",
-            "descripcion": "ACTIVO NO CORRIENTE",
-            "tipo": TipoCuenta.ACTIVO,
-            "naturaleza": NaturalezaCuenta.DEUDORA,
-            "es_auxiliar": False,
-        },
-        {
-            "codigo": "1.2.01",
-            "descripcion": "MUEBLES Y ENSERES",
-            "tipo": TipoCuenta.ACTIVO,
-            "naturaleza": NaturalezaCuenta.DEUDORA,
-            "es_auxiliar": True,
-        },
-        {
-            "codigo": "1.2.02",
-            "descripcion": "EQUIPOS DE OFICINA",
-            "tipo": TipoCuenta.ACTIVO,
-            "naturaleza": NaturalezaCuenta.DEUDORA,
-            "es_auxiliar": True,
-        },
-        {
-            "codigo": "1.2.03",
-            "descripcion": "EQUIPOS DE CÓMPUTO",
-            "tipo": TipoCuenta.ACTIVO,
-            "naturaleza": NaturalezaCuenta.DEUDORA,
-            "es_auxiliar": True,
-        },
-        {
-            "codigo": "1.2.04",
-            "descripcion": "VEHÍCULOS",
-            "tipo": TipoCuenta.ACTIVO,
-            "naturaleza": NaturalezaCuenta.DEUDORA,
-            "es_auxiliar": True,
-        },
-        # PASIVOS (2)
-        {
-            "codigo": "2",
-            "descripcion": "PASIVO",
-            "tipo": TipoCuenta.PASIVO,
-            "naturaleza": NaturalezaCuenta.ACREEDORA,
-            "es_auxiliar": False,
-        },
-        {
-            "codigo": "2.1",
-            "descripcion": "PASIVO CORRIENTE",
-            "tipo": TipoCuenta.PASIVO,
-            "naturaleza": NaturalezaCuenta.ACREEDORA,
-            "es_auxiliar": False,
-        },
-        {
-            "codigo": "2.1.01",
-            "descripcion": "CUENTAS POR PAGAR PROVEEDORES",
-            "tipo": TipoCuenta.PASIVO,
-            "naturaleza": NaturalezaCuenta.ACREEDORA,
-            "es_auxiliar": True,
-        },
-        {
-            "codigo": "2.1.02",
-            "descripcion": "IMPUESTOS POR PAGAR",
-            "tipo": TipoCuenta.PASIVO,
-            "naturaleza": NaturalezaCuenta.ACREEDORA,
-            "es_auxiliar": True,
-        },
-        {
-            "codigo": "2.1.03",
-            "descripcion": "SALARIOS POR PAGAR",
-            "tipo": TipoCuenta.PASIVO,
-            "naturaleza": NaturalezaCuenta.ACREEDORA,
-            "es_auxiliar": True,
-        },
-        {
-            "codigo": "2.2",
-            "descripcion": "PASIVO NO CORRIENTE",
-            "tipo": TipoCuenta.PASIVO,
-            "naturaleza": NaturalezaCuenta.ACREEDORA,
-            "es_auxiliar": False,
-        },
-        {
-            "codigo": "2.2.01",
-            "descripcion": "PRÉSTAMOS BANCARIOS LARGO PLAZO",
-            "tipo": TipoCuenta.PASIVO,
-            "naturaleza": NaturalezaCuenta.ACREEDORA,
-            "es_auxiliar": True,
-        },
-        # PATRIMONIO (3)
-        {
-            "codigo": "3",
-            "descripcion": "PATRIMONIO",
-            "tipo": TipoCuenta.PATRIMONIO,
-            "naturaleza": NaturalezaCuenta.ACREEDORA,
-            "es_auxiliar": False,
-        },
-        {
-            "codigo": "3.1",
-            "descripcion": "CAPITAL",
-            "tipo": TipoCuenta.PATRIMONIO,
-            "naturaleza": NaturalezaCuenta.ACREEDORA,
-            "es_auxiliar": False,
-        },
-        {
-            "codigo": "3.1.01",
-            "descripcion": "CAPITAL SOCIAL",
-            "tipo": TipoCuenta.PATRIMONIO,
-            "naturaleza": NaturalezaCuenta.ACREEDORA,
-            "es_auxiliar": True,
-        },
-        {
-            "codigo": "3.2",
-            "descripcion": "RESULTADOS",
-            "tipo": TipoCuenta.PATRIMONIO,
-            "naturaleza": NaturalezaCuenta.ACREEDORA,
-            "es_auxiliar": False,
-        },
-        {
-            "codigo": "3.2.01",
-            "descripcion": "UTILIDADES RETENIDAS",
-            "tipo": TipoCuenta.PATRIMONIO,
-            "naturaleza": NaturalezaCuenta.ACREEDORA,
-            "es_auxiliar": True,
-        },
-        {
-            "codigo": "3.2.02",
-            "descripcion": "UTILIDAD DEL EJERCICIO",
-            "tipo": TipoCuenta.PATRIMONIO,
-            "naturaleza": NaturalezaCuenta.ACREEDORA,
-            "es_auxiliar": True,
-        },
-        # INGRESOS (4)
-        {
-            "codigo": "4",
-            "descripcion": "INGRESOS",
-            "tipo": TipoCuenta.INGRESO,
-            "naturaleza": NaturalezaCuenta.ACREEDORA,
-            "es_auxiliar": False,
-        },
-        {
-            "codigo": "4.1",
-            "descripcion": "INGRESOS OPERACIONALES",
-            "tipo": TipoCuenta.INGRESO,
-            "naturaleza": NaturalezaCuenta.ACREEDORA,
-            "es_auxiliar": False,
-        },
-        {
-            "codigo": "4.1.01",
-            "descripcion": "VENTAS DE PRODUCTOS",
-            "tipo": TipoCuenta.INGRESO,
-            "naturaleza": NaturalezaCuenta.ACREEDORA,
-            "es_auxiliar": True,
-        },
-        {
-            "codigo": "4.1.02",
-            "descripcion": "PRESTACIÓN DE SERVICIOS",
-            "tipo": TipoCuenta.INGRESO,
-            "naturaleza": NaturalezaCuenta.ACREEDORA,
-            "es_auxiliar": True,
-        },
-        {
-            "codigo": "4.2",
-            "descripcion": "INGRESOS NO OPERACIONALES",
-            "tipo": TipoCuenta.INGRESO,
-            "naturaleza": NaturalezaCuenta.ACREEDORA,
-            "es_auxiliar": False,
-        },
-        {
-            "codigo": "4.2.01",
-            "descripcion": "INTERESES GANADOS",
-            "tipo": TipoCuenta.INGRESO,
-            "naturaleza": NaturalezaCuenta.ACREEDORA,
-            "es_auxiliar": True,
-        },
-        # GASTOS (5)
-        {
-            "codigo": "5",
-            "descripcion": "GASTOS",
-            "tipo": TipoCuenta.GASTO,
-            "naturaleza": NaturalezaCuenta.DEUDORA,
-            "es_auxiliar": False,
-        },
-        {
-            "codigo": "5.1",
-            "descripcion": "COSTO DE VENTAS",
-            "tipo": TipoCuenta.GASTO,
-            "naturaleza": NaturalezaCuenta.DEUDORA,
-            "es_auxiliar": False,
-        },
-        {
-            "codigo": "5.1.01",
-            "descripcion": "COSTO DE PRODUCTOS VENDIDOS",
-            "tipo": TipoCuenta.GASTO,
-            "naturaleza": NaturalezaCuenta.DEUDORA,
-            "es_auxiliar": True,
-        },
-        {
-            "codigo": "5.2",
-            "descripcion": "GASTOS ADMINISTRATIVOS",
-            "tipo": TipoCuenta.GASTO,
-            "naturaleza": NaturalezaCuenta.DEUDORA,
-            "es_auxiliar": False,
-        },
-        {
-            "codigo": "5.2.01",
-            "descripcion": "SUELDOS Y SALARIOS",
-            "tipo": TipoCuenta.GASTO,
-            "naturaleza": NaturalezaCuenta.DEUDORA,
-            "es_auxiliar": True,
-        },
-        {
-            "codigo": "5.2.02",
-            "descripcion": "ARRIENDO",
-            "tipo": TipoCuenta.GASTO,
-            "naturaleza": NaturalezaCuenta.DEUDORA,
-            "es_auxiliar": True,
-        },
-        {
-            "codigo": "5.2.03",
-            "descripcion": "SERVICIOS PÚBLICOS",
-            "tipo": TipoCuenta.GASTO,
-            "naturaleza": NaturalezaCuenta.DEUDORA,
-            "es_auxiliar": True,
-        },
-        {
-            "codigo": "5.2.04",
-            "descripcion": "ÚTILES Y PAPELERÍA",
-            "tipo": TipoCuenta.GASTO,
-            "naturaleza": NaturalezaCuenta.DEUDORA,
-            "es_auxiliar": True,
-        },
-        {
-            "codigo": "5.3",
-            "descripcion": "GASTOS DE VENTAS",
-            "tipo": TipoCuenta.GASTO,
-            "naturaleza": NaturalezaCuenta.DEUDORA,
-            "es_auxiliar": False,
-        },
-        {
-            "codigo": "5.3.01",
-            "descripcion": "COMISIONES DE VENTAS",
-            "tipo": TipoCuenta.GASTO,
-            "naturaleza": NaturalezaCuenta.DEUDORA,
-            "es_auxiliar": True,
-        },
-        {
-            "codigo": "5.3.02",
-            "descripcion": "PUBLICIDAD Y MARKETING",
-            "tipo": TipoCuenta.GASTO,
-            "naturaleza": NaturalezaCuenta.DEUDORA,
-            "es_auxiliar": True,
-        },
-        {
-            "codigo": "5.4",
-            "descripcion": "GASTOS FINANCIEROS",
-            "tipo": TipoCuenta.GASTO,
-            "naturaleza": NaturalezaCuenta.DEUDORA,
-            "es_auxiliar": False,
-        },
-        {
-            "codigo": "5.4.01",
-            "descripcion": "INTERESES PAGADOS",
-            "tipo": TipoCuenta.GASTO,
-            "naturaleza": NaturalezaCuenta.DEUDORA,
-            "es_auxiliar": True,
-        },
-    ]
-
-    cuentas_creadas = {}
-    for cuenta_data in cuentas:
-        cuenta, created = EmpresaPlanCuenta.objects.get_or_create(
+    # Una consulta para los códigos existentes y un único INSERT para los que faltan
+    existentes = set(
+        EmpresaPlanCuenta.objects.filter(empresa=empresa).values_list("codigo", flat=True)
+    )
+    nuevas = [
+        EmpresaPlanCuenta(
             empresa=empresa,
-            codigo=cuenta_data["codigo"],
-            defaults={
-                "descripcion": cuenta_data["descripcion"],
-                "tipo": cuenta_data["tipo"],
-                "naturaleza": cuenta_data["naturaleza"],
-                "es_auxiliar": cuenta_data["es_auxiliar"],
-                "activa": True,
-            },
+            codigo=c["codigo"],
+            descripcion=c["descripcion"],
+            tipo=c["tipo"],
+            naturaleza=c["naturaleza"],
+            es_auxiliar=c["es_auxiliar"],
+            activa=True,
         )
-        cuentas_creadas[cuenta.codigo] = cuenta
-        if created:
-            print(f"  ✓ Creada: {cuenta.codigo} - {cuenta.descripcion}")
-        else:
-            print(f"  → Existente: {cuenta.codigo} - {cuenta.descripcion}")
+        for c in PLAN_CUENTAS
+        if c["codigo"] not in existentes
+    ]
+    # unique_together (empresa, codigo) hace idempotente la carga ante ejecuciones concurrentes
+    EmpresaPlanCuenta.objects.bulk_create(nuevas, ignore_conflicts=True)
+
+    for c in PLAN_CUENTAS:
+        estado = "→ Existente" if c["codigo"] in existentes else "✓ Creada"
+        print(f"  {estado}: {c['codigo']} - {c['descripcion']}")
+
+    # `codigo` solo es único junto con `empresa`, por lo que in_bulk(field_name="codigo")
+    # no está permitido: se indexa el plan completo con una sola consulta
+    cuentas_creadas = {
+        cuenta.codigo: cuenta for cuenta in EmpresaPlanCuenta.objects.filter(empresa=empresa)
+    }
 
     print(f"\n✅ Plan de cuentas completo: {len(cuentas_creadas)} cuentas")
     return cuentas_creadas
@@ -402,27 +424,91 @@ def crear_terceros(empresa, usuario):
         {"tipo": "EMPLEADO", "numero_identificacion": "1122334455", "nombre": "CARLOS LÓPEZ"},
     ]
 
-    terceros_creados = []
-    for tercero_data in terceros_data:
-        tercero, created = EmpresaTercero.objects.get_or_create(
+    # Misma estrategia que el plan de cuentas: diff en memoria + un único INSERT
+    existentes = set(
+        EmpresaTercero.objects.filter(empresa=empresa).values_list(
+            "numero_identificacion", flat=True
+        )
+    )
+    EmpresaTercero.objects.bulk_create(
+        [
+            EmpresaTercero(
+                empresa=empresa,
+                numero_identificacion=t["numero_identificacion"],
+                tipo=t["tipo"],
+                nombre=t["nombre"],
+                creado_por=usuario,
+            )
+            for t in terceros_data
+            if t["numero_identificacion"] not in existentes
+        ],
+        ignore_conflicts=True,
+    )
+
+    for t in terceros_data:
+        estado = "→ Existente" if t["numero_identificacion"] in existentes else "✓ Creado"
+        print(f"  {estado}: {t['nombre']}")
+
+    terceros_creados = list(
+        EmpresaTercero.objects.filter(
             empresa=empresa,
-            numero_identificacion=tercero_data["numero_identificacion"],
-            defaults={
-                "tipo": tercero_data["tipo"],
-                "nombre": tercero_data["nombre"],
-                "creado_por": usuario,
-            },
+            numero_identificacion__in=[t["numero_identificacion"] for t in terceros_data],
         )
-        terceros_creados.append(tercero)
-        if created:
-            print(f"  ✓ Creado: {tercero.nombre}")
-        else:
-            print(f"  → Existente: {tercero.nombre}")
+    )
 
     print(f"\n✅ Terceros creados: {len(terceros_creados)}")
     return terceros_creados
 
 
+def _compilar_monto(valor):
+    """Convierte la especificación de un monto en una función del valor de referencia."""
+    if isinstance(valor, tuple):
+        # Rango aleatorio: el monto es el propio valor de referencia sorteado
+        return Decimal
+    if callable(valor):
+        return lambda ref: Decimal(valor(ref))
+    constante = Decimal(valor)
+    return lambda ref: constante
+
+
+def crear_emisor(tipo_trans):
+    """Compila un tipo de transacción en una función que genera sus líneas.
+
+    Devuelve (emitir, rango). `emitir` recibe el valor de referencia sorteado (o None)
+    y la lista de terceros, y devuelve tuplas (cuenta_id, tercero_id, detalle, debe,
+    haber). `rango` es el (min, max) del monto aleatorio, o None si no lo hay. Toda
+    la inspección de la especificación ocurre aquí, fuera del bucle de generación.
+    """
+    detalle = tipo_trans["descripcion"]
+    lineas = [
+        (
+            linea["cuenta"].pk,
+            bool(linea.get("tercero")),
+            _compilar_monto(linea["debe"]),
+            _compilar_monto(linea["haber"]),
+        )
+        for linea in tipo_trans["lineas"]
+    ]
+
+    def emitir(valor_referencia, terceros):
+        return [
+            (
+                cuenta_id,
+                choice(terceros).pk if con_tercero and terceros else None,
+                detalle,
+                debe(valor_referencia),
+                haber(valor_referencia),
+            )
+            for cuenta_id, con_tercero, debe, haber in lineas
+        ]
+
+    rango = next(
+        (linea["debe"] for linea in tipo_trans["lineas"] if isinstance(linea["debe"], tuple)),
+        None,
+    )
+    return emitir, rango
+
+
 def generar_asientos_historicos(empresa, cuentas, terceros, usuario):
     """Genera asientos contables históricos variados."""
     print_step(f"📝 GENERANDO {NUM_ASIENTOS} ASIENTOS HISTÓRICOS")
@@ -458,7 +544,8 @@ def generar_asientos_historicos(empresa, cuentas, terceros, usuario):
     publicidad = cuentas.get("5.3.02")
     intereses_pagados = cuentas.get("5.4.01")
 
-    # Tipos de transacciones posibles
+    # Tipos de transacciones posibles. Un "debe" (min, max) es un monto aleatorio que
+    # además sirve de valor de referencia para las funciones del "haber".
     tipos_transacciones = [
         # 1. Aporte de capital inicial
         {
@@ -474,7 +561,7 @@ def generar_asientos_historicos(empresa, cuentas, terceros, usuario):
             "lineas": [
                 {
                     "cuenta": caja,
-                    "debe": lambda: randint(500000, 5000000),
+                    "debe": (500000, 5000000),
                     "haber": 0,
                     "tercero": True,
                 },
@@ -487,7 +574,7 @@ def generar_asientos_historicos(empresa, cuentas, terceros, usuario):
             "lineas": [
                 {
                     "cuenta": cxc_clientes,
-                    "debe": lambda: randint(1000000, 8000000),
+                    "debe": (1000000, 8000000),
                     "haber": 0,
                     "tercero": True,
                 },
@@ -498,7 +585,7 @@ def generar_asientos_historicos(empresa, cuentas, terceros, usuario):
         {
             "descripcion": "Cobro de cartera a clientes",
             "lineas": [
-                {"cuenta": bancos, "debe": lambda: randint(500000, 3000000), "haber": 0},
+                {"cuenta": bancos, "debe": (500000, 3000000), "haber": 0},
                 {"cuenta": cxc_clientes, "debe": 0, "haber": lambda v: v, "tercero": True},
             ],
         },
@@ -508,7 +595,7 @@ def generar_asientos_historicos(empresa, cuentas, terceros, usuario):
             "lineas": [
                 {
                     "cuenta": caja,
-                    "debe": lambda: randint(800000, 4000000),
+                    "debe": (800000, 4000000),
                     "haber": 0,
                     "tercero": True,
                 },
@@ -519,7 +606,7 @@ def generar_asientos_historicos(empresa, cuentas, terceros, usuario):
         {
             "descripcion": "Compra de inventario a proveedores",
             "lineas": [
-                {"cuenta": inventarios, "debe": lambda: randint(2000000, 10000000), "haber": 0},
+                {"cuenta": inventarios, "debe": (2000000, 10000000), "haber": 0},
                 {"cuenta": cxp_proveedores, "debe": 0, "haber": lambda v: v, "tercero": True},
             ],
         },
@@ -529,7 +616,7 @@ def generar_asientos_historicos(empresa, cuentas, terceros, usuario):
             "lineas": [
                 {
                     "cuenta": cxp_proveedores,
-                    "debe": lambda: randint(1000000, 5000000),
+                    "debe": (1000000, 5000000),
                     "haber": 0,
                     "tercero": True,
                 },
@@ -540,16 +627,17 @@ def generar_asientos_historicos(empresa, cuentas, terceros, usuario):
         {
             "descripcion": "Pago de sueldos y salarios",
             "lineas": [
-                {"cuenta": sueldos, "debe": lambda: randint(3000000, 8000000), "haber": 0},
+                {"cuenta": sueldos, "debe": (3000000, 8000000), "haber": 0},
                 {"cuenta": bancos, "debe": 0, "haber": lambda v: int(v * 0.92)},
-                {"cuenta": salarios_pagar, "debe": 0, "haber": lambda v: int(v * 0.08)},
+                # El resto (no v * 0.08) para que el asiento siempre cuadre
+                {"cuenta": salarios_pagar, "debe": 0, "haber": lambda v: v - int(v * 0.92)},
             ],
         },
         # 9. Pago de arriendo
         {
             "descripcion": "Pago de arriendo del local",
             "lineas": [
-                {"cuenta": arriendo, "debe": lambda: randint(1500000, 3000000), "haber": 0},
+                {"cuenta": arriendo, "debe": (1500000, 3000000), "haber": 0},
                 {"cuenta": bancos, "debe": 0, "haber": lambda v: v},
             ],
         },
@@ -557,7 +645,7 @@ def generar_asientos_historicos(empresa, cuentas, terceros, usuario):
         {
             "descripcion": "Pago de servicios públicos",
             "lineas": [
-                {"cuenta": servicios_publicos, "debe": lambda: randint(200000, 800000), "haber": 0},
+                {"cuenta": servicios_publicos, "debe": (200000, 800000), "haber": 0},
                 {"cuenta": caja, "debe": 0, "haber": lambda v: v},
             ],
         },
@@ -565,7 +653,7 @@ def generar_asientos_historicos(empresa, cuentas, terceros, usuario):
         {
             "descripcion": "Compra de útiles y papelería",
             "lineas": [
-                {"cuenta": papeleria, "debe": lambda: randint(100000, 500000), "haber": 0},
+                {"cuenta": papeleria, "debe": (100000, 500000), "haber": 0},
                 {"cuenta": caja, "debe": 0, "haber": lambda v: v},
             ],
         },
@@ -573,7 +661,7 @@ def generar_asientos_historicos(empresa, cuentas, terceros, usuario):
         {
             "descripcion": "Inversión en publicidad y marketing",
             "lineas": [
-                {"cuenta": publicidad, "debe": lambda: randint(500000, 2000000), "haber": 0},
+                {"cuenta": publicidad, "debe": (500000, 2000000), "haber": 0},
                 {"cuenta": bancos, "debe": 0, "haber": lambda v: v},
             ],
         },
@@ -581,7 +669,7 @@ def generar_asientos_historicos(empresa, cuentas, terceros, usuario):
         {
             "descripcion": "Compra de equipos de cómputo",
             "lineas": [
-                {"cuenta": equipos_computo, "debe": lambda: randint(2000000, 5000000), "haber": 0},
+                {"cuenta": equipos_computo, "debe": (2000000, 5000000), "haber": 0},
                 {"cuenta": bancos, "debe": 0, "haber": lambda v: v},
             ],
         },
@@ -589,7 +677,7 @@ def generar_asientos_historicos(empresa, cuentas, terceros, usuario):
         {
             "descripcion": "Pago de intereses sobre préstamos",
             "lineas": [
-                {"cuenta": intereses_pagados, "debe": lambda: randint(300000, 1000000), "haber": 0},
+                {"cuenta": intereses_pagados, "debe": (300000, 1000000), "haber": 0},
                 {"cuenta": bancos, "debe": 0, "haber": lambda v: v},
             ],
         },
@@ -597,87 +685,78 @@ def generar_asientos_historicos(empresa, cuentas, terceros, usuario):
         {
             "descripcion": "Pago de comisiones a vendedores",
             "lineas": [
-                {"cuenta": comisiones, "debe": lambda: randint(400000, 1500000), "haber": 0},
+                {"cuenta": comisiones, "debe": (400000, 1500000), "haber": 0},
                 {"cuenta": caja, "debe": 0, "haber": lambda v: v, "tercero": True},
             ],
         },
     ]
 
-    asientos_creados = 0
-    errores = 0
+    # Cada tipo se compila una sola vez en un emisor de líneas; la lista sigue el
+    # orden de tipos_transacciones y se indexa con el número de tipo sorteado
+    emisores = [crear_emisor(tipo) for tipo in tipos_transacciones]
+
+    primero = siguiente_numero_asiento(empresa)
+
+    # Días y tipos (por índice) aleatorios, ordenados por fecha para que la numeración
+    # sea cronológica y las inserciones en el índice de fecha sean casi secuenciales
+    rng = np.random.default_rng()
+    dias = rng.integers(0, 30 * MESES_HISTORIA, size=NUM_ASIENTOS, endpoint=True)
+    indices = rng.integers(0, len(tipos_transacciones), size=NUM_ASIENTOS)
+    sorteo = sorted(zip(dias.tolist(), indices.tolist(), strict=True))
+
+    # Montos aleatorios vectorizados: un único sorteo de numpy por tipo con rango,
+    # del tamaño del número de asientos de ese tipo, en lugar de un randint por asiento
+    usos = Counter(indice for _, indice in sorteo)
+    montos = [
+        iter(rng.integers(*rango, size=usos[indice], endpoint=True).tolist())
+        if rango is not None
+        else None
+        for indice, (_emitir, rango) in enumerate(emisores)
+    ]
 
-    for i in range(NUM_ASIENTOS):
-        # Fecha aleatoria dentro del rango
-        dias_desde_inicio = randint(0, 30 * MESES_HISTORIA)
-        fecha_asiento = fecha_inicial + timedelta(days=dias_desde_inicio)
+    # Primera pasada: cabeceras sin guardar junto al índice del tipo que las genera
+    plan = []
+    for i, (dia, indice) in enumerate(sorteo):
+        asiento = EmpresaAsiento(
+            empresa=empresa,
+            numero_asiento=primero + i,
+            fecha=fecha_inicial + timedelta(days=dia),
+            descripcion_general=tipos_transacciones[indice]["descripcion"],
+            creado_por=usuario,
+            estado=EstadoAsiento.CONFIRMADO,
+        )
+        plan.append((asiento, indice))
 
-        # Seleccionar tipo de transacción aleatorio
-        tipo_trans = choice(tipos_transacciones)
+    lineas_nuevas = []
+    log_lines: list[str] = []
 
-        try:
-            # Crear asiento
-            numero_asiento = EmpresaAsiento.objects.filter(empresa=empresa).count() + 1
-            asiento = EmpresaAsiento.objects.create(
-                empresa=empresa,
-                numero_asiento=numero_asiento,
-                fecha=fecha_asiento,
-                descripcion=tipo_trans["descripcion"],
-                creado_por=usuario,
-                estado=EstadoAsiento.CONFIRMADO,
-            )
+    # Sin ignore_conflicts: en MariaDB impediría recuperar las PK que necesitan las
+    # líneas. unique_together (empresa, numero_asiento) ya protege la numeración.
+    EmpresaAsiento.objects.bulk_create([asiento for asiento, _ in plan])
 
-            # Generar montos dinámicos
-            valor_referencia = None
-
-            # Crear transacciones
-            for linea in tipo_trans["lineas"]:
-                # Calcular montos
-                if callable(linea["debe"]):
-                    if valor_referencia is None:
-                        valor_referencia = linea["debe"]()
-                    debe = Decimal(
-                        str(
-                            linea["debe"](valor_referencia)
-                            if linea["debe"].__code__.co_argcount > 0
-                            else linea["debe"]()
-                        )
-                    )
-                else:
-                    debe = Decimal(str(linea["debe"]))
-
-                if callable(linea["haber"]):
-                    haber = Decimal(str(linea["haber"](valor_referencia)))
-                else:
-                    haber = Decimal(str(linea["haber"]))
-
-                # Seleccionar tercero si es necesario
-                tercero = None
-                if linea.get("tercero") and terceros:
-                    tercero = choice(terceros)
-
-                # Crear transacción
-                EmpresaTransaccion.objects.create(
-                    asiento=asiento,
-                    cuenta=linea["cuenta"],
-                    detalle=tipo_trans["descripcion"],
-                    debe=debe,
-                    haber=haber,
-                    tercero=tercero,
-                )
-
-            asientos_creados += 1
-            if asientos_creados % 10 == 0:
-                print(f"  ✓ {asientos_creados} asientos creados...")
-
-        except Exception as e:
-            errores += 1
-            print(f"  ✗ Error en asiento {i+1}: {e}")
-
-    print(f"\n✅ Asientos creados: {asientos_creados}")
-    if errores > 0:
-        print(f"⚠️ Errores: {errores}")
-
-    return asientos_creados
+    # Segunda pasada: líneas de cada asiento (ya con PK asignada)
+    for asientos_creados, (asiento, indice) in enumerate(plan, start=1):
+        emitir, _rango = emisores[indice]
+        pendientes = montos[indice]
+        valor_referencia = next(pendientes) if pendientes is not None else None
+        lineas_nuevas.extend((asiento.pk, *fila) for fila in emitir(valor_referencia, terceros))
+
+        if asientos_creados % 10 == 0:
+            log_lines.append(f"  ✓ {asientos_creados} asientos creados...")
+
+    insertar_transacciones(
+        lineas_nuevas,
+        ("asiento_id", "cuenta_id", "tercero_id", "detalle_linea", "debe", "haber"),
+        rapido=FAST,
+    )
+
+    # Progreso volcado de una sola vez en lugar de un print por bloque
+    if log_lines:
+        sys.stdout.write("\n".join(log_lines) + "\n")
+
+    print(f"\n✅ Asientos creados: {len(plan)}")
+
+    return len(plan)
 
 
 def main():
@@ -689,21 +768,34 @@ def main():
     try:
         # Obtener empresa
         print_step("🔍 VERIFICANDO EMPRESA")
-        empresa = Empresa.objects.get(id=EMPRESA_ID)
+        empresa = Empresa.objects.select_related("owner").get(id=EMPRESA_ID)
         print(f"  ✓ Empresa encontrada: {empresa.nombre} (ID: {empresa.id})")
         print(f"  ✓ Propietario: {empresa.owner.username}")
 
         # Obtener usuario
         usuario = empresa.owner
 
-        # Crear plan de cuentas
-        cuentas = crear_plan_cuentas_completo(empresa)
+        # Re-ejecuciones: dos COUNT bastan para saber que no hay nada que hacer
+        if (
+            not FORCE
+            and EmpresaAsiento.objects.filter(empresa=empresa).count() >= NUM_ASIENTOS
+            and EmpresaPlanCuenta.objects.filter(empresa=empresa).count() >= len(PLAN_CUENTAS)
+        ):
+            print(
+                "\n  ✓ Los datos de prueba ya existen, no se genera nada (usa FORCE=1 para forzar)."
+            )
+            return
+
+        # Todo el seed en una única transacción: un solo commit y rollback completo ante errores
+        with transaction.atomic():
+            # Crear plan de cuentas
+            cuentas = crear_plan_cuentas_completo(empresa)
 
-        # Crear terceros
-        terceros = crear_terceros(empresa, usuario)
+            # Crear terceros
+            terceros = crear_terceros(empresa, usuario)
 
-        # Generar asientos históricos
-        asientos_creados = generar_asientos_historicos(empresa, cuentas, terceros, usuario)
+            # Generar asientos históricos
+            asientos_creados = generar_asientos_historicos(empresa, cuentas, terceros, usuario)
 
         # Resumen final
         print_step("📊 RESUMEN FINAL")
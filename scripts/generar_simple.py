@@ -15,9 +15,12 @@ print("Django configurado correctamente")
 
 from datetime import date, timedelta
 from decimal import Decimal
-from random import choice, randint
+from typing import NamedTuple
 
+import numpy as np
 from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from scripts.carga_masiva import siguiente_numero_asiento
 
 from contabilidad.models import (
     Empresa,
@@ -32,7 +35,20 @@ print("Imports completados")
 
 User = get_user_model()
 
+ZERO = Decimal("0.00")
 
+
+class TipoAsiento(NamedTuple):
+    """Plantilla de asiento: cuenta al debe, cuenta al haber y rango de montos."""
+
+    cuenta_debe: EmpresaPlanCuenta | None
+    cuenta_haber: EmpresaPlanCuenta | None
+    descripcion: str
+    monto_min: int
+    monto_max: int
+
+
+@transaction.atomic
 def main():
     print("\n" + "=" * 60)
     print("  GENERADOR DE DATOS ML/AI")
@@ -73,8 +89,23 @@ def main():
 
     # Obtener cuentas existentes
     print("\nObteniendo cuentas...")
-    caja = EmpresaPlanCuenta.objects.filter(empresa=empresa, codigo="1.1.01").first()
-    ventas = EmpresaPlanCuenta.objects.filter(empresa=empresa, codigo="4.1.01").first()
+    codigos = [
+        "1.1.01",
+        "1.1.02",
+        "1.1.03",
+        "1.1.04",
+        "2.1.01",
+        "4.1.01",
+        "5.1.01",
+        "5.2.01",
+        "5.2.02",
+    ]
+    # Una sola consulta IN en lugar de un SELECT por cuenta
+    cuentas = {
+        c.codigo: c for c in EmpresaPlanCuenta.objects.filter(empresa=empresa, codigo__in=codigos)
+    }
+    caja = cuentas.get("1.1.01")
+    ventas = cuentas.get("4.1.01")
 
     if not caja or not ventas:
         print("❌ Cuentas básicas no encontradas (1.1.01, 4.1.01)")
@@ -88,80 +119,119 @@ def main():
     fecha_inicial = date.today() - timedelta(days=365)
 
     # Obtener más cuentas para variedad
-    bancos = EmpresaPlanCuenta.objects.filter(empresa=empresa, codigo="1.1.02").first()
-    cxc_clientes = EmpresaPlanCuenta.objects.filter(empresa=empresa, codigo="1.1.03").first()
-    inventarios = EmpresaPlanCuenta.objects.filter(empresa=empresa, codigo="1.1.04").first()
-    cxp_proveedores = EmpresaPlanCuenta.objects.filter(empresa=empresa, codigo="2.1.01").first()
-    costo_ventas = EmpresaPlanCuenta.objects.filter(empresa=empresa, codigo="5.1.01").first()
-    sueldos = EmpresaPlanCuenta.objects.filter(empresa=empresa, codigo="5.2.01").first()
-    arriendo = EmpresaPlanCuenta.objects.filter(empresa=empresa, codigo="5.2.02").first()
+    bancos = cuentas.get("1.1.02")
+    cxc_clientes = cuentas.get("1.1.03")
+    inventarios = cuentas.get("1.1.04")
+    cxp_proveedores = cuentas.get("2.1.01")
+    costo_ventas = cuentas.get("5.1.01")
+    sueldos = cuentas.get("5.2.01")
+    arriendo = cuentas.get("5.2.02")
 
     tipos_asientos = [
-        # (cuenta_debe, cuenta_haber, descripcion, monto_min, monto_max)
-        (caja, ventas, "Venta en efectivo", 100000, 1000000),
-        (bancos, ventas, "Venta con tarjeta", 200000, 1500000),
-        (cxc_clientes, ventas, "Venta a crédito", 500000, 3000000),
-        (bancos, cxc_clientes, "Cobro a cliente", 300000, 2000000),
-        (inventarios, cxp_proveedores, "Compra de mercancía", 400000, 2500000),
-        (cxp_proveedores, bancos, "Pago a proveedor", 300000, 2000000),
-        (costo_ventas, inventarios, "Costo de ventas", 200000, 800000),
-        (sueldos, bancos, "Pago de nómina", 1000000, 3000000),
-        (arriendo, caja, "Pago de arriendo", 800000, 1500000),
+        TipoAsiento(caja, ventas, "Venta en efectivo", 100000, 1000000),
+        TipoAsiento(bancos, ventas, "Venta con tarjeta", 200000, 1500000),
+        TipoAsiento(cxc_clientes, ventas, "Venta a crédito", 500000, 3000000),
+        TipoAsiento(bancos, cxc_clientes, "Cobro a cliente", 300000, 2000000),
+        TipoAsiento(inventarios, cxp_proveedores, "Compra de mercancía", 400000, 2500000),
+        TipoAsiento(cxp_proveedores, bancos, "Pago a proveedor", 300000, 2000000),
+        TipoAsiento(costo_ventas, inventarios, "Costo de ventas", 200000, 800000),
+        TipoAsiento(sueldos, bancos, "Pago de nómina", 1000000, 3000000),
+        TipoAsiento(arriendo, caja, "Pago de arriendo", 800000, 1500000),
     ]
 
-    for i in range(60):
-        # Seleccionar tipo de asiento aleatoriamente
-        cuenta_debe, cuenta_haber, descripcion, min_m, max_m = choice(tipos_asientos)
+    # Tercero apropiado (su id) para cada tipo, clasificado una sola vez por su descripción
+    tercero_por_tipo = []
+    for tipo in tipos_asientos:
+        texto = tipo.descripcion.lower()
+        if "cliente" in texto or "cobro" in texto or "venta" in texto:
+            tercero_por_tipo.append(terceros[0].pk)
+        elif "proveedor" in texto or "compra" in texto:
+            tercero_por_tipo.append(terceros[1].pk if len(terceros) > 1 else None)
+        else:
+            tercero_por_tipo.append(None)
+
+    # Sorteos vectorizados: tipo (por índice), días y montos agrupados por tipo
+    rng = np.random.default_rng()
+    tipo_idx = rng.integers(0, len(tipos_asientos), size=60)
+    offsets = rng.integers(0, 360, size=60, endpoint=True)
+    montos = np.empty(60, dtype=np.int64)
+    for t, tipo in enumerate(tipos_asientos):
+        mascara = tipo_idx == t
+        montos[mascara] = rng.integers(
+            tipo.monto_min, tipo.monto_max, size=int(mascara.sum()), endpoint=True
+        )
+
+    # Convertir los montos a Decimal de una sola vez
+    montos_decimal = [Decimal(m) for m in montos.tolist()]
+
+    # Primera pasada: datos de cada asiento en memoria
+    pendientes = []
+    for i, (t, dias_offset, monto) in enumerate(
+        zip(tipo_idx.tolist(), offsets.tolist(), montos_decimal, strict=True)
+    ):
+        tipo = tipos_asientos[t]
 
         # Verificar que ambas cuentas existan
-        if not cuenta_debe or not cuenta_haber:
+        if not tipo.cuenta_debe or not tipo.cuenta_haber:
             continue
 
         # Fecha aleatoria en el último año
-        dias_offset = randint(0, 360)
         fecha = fecha_inicial + timedelta(days=dias_offset)
-        monto = Decimal(randint(min_m, max_m))
-
-        # Seleccionar tercero apropiado
-        if (
-            "cliente" in descripcion.lower()
-            or "cobro" in descripcion.lower()
-            or "venta" in descripcion.lower()
-        ):
-            tercero = terceros[0]
-        elif "proveedor" in descripcion.lower() or "compra" in descripcion.lower():
-            tercero = terceros[1] if len(terceros) > 1 else None
-        else:
-            tercero = None
 
-        asiento = EmpresaAsiento.objects.create(
-            empresa=empresa,
-            fecha=fecha,
-            descripcion_general=f"{descripcion} {i+1}",
-            estado=EstadoAsiento.CONFIRMADO,
-            creado_por=usuario,
+        pendientes.append(
+            (
+                fecha,
+                f"{tipo.descripcion} {i+1}",
+                tipo.cuenta_debe.pk,
+                tipo.cuenta_haber.pk,
+                monto,
+                tercero_por_tipo[t],
+            )
         )
 
-        # Transacción débito
-        EmpresaTransaccion.objects.create(
-            asiento=asiento,
-            cuenta=cuenta_debe,
-            debe=monto,
-            haber=Decimal("0.00"),
-            tercero=tercero,
+    primero = siguiente_numero_asiento(empresa)
+
+    creados = EmpresaAsiento.objects.bulk_create(
+        [
+            EmpresaAsiento(
+                empresa_id=empresa.pk,
+                numero_asiento=primero + n,
+                fecha=fecha,
+                descripcion_general=descripcion_general,
+                estado=EstadoAsiento.CONFIRMADO,
+                creado_por_id=usuario.pk,
+            )
+            for n, (fecha, descripcion_general, *_resto) in enumerate(pendientes)
+        ]
+    )
+
+    # Segunda pasada: una línea al debe y otra al haber por asiento
+    transacciones = []
+    # Asignar las FK por id evita resolver instancias relacionadas
+    for asiento, (_f, _d, cuenta_debe_id, cuenta_haber_id, monto, tercero_id) in zip(
+        creados, pendientes, strict=True
+    ):
+        transacciones.append(
+            EmpresaTransaccion(
+                asiento_id=asiento.pk,
+                cuenta_id=cuenta_debe_id,
+                debe=monto,
+                haber=ZERO,
+                tercero_id=tercero_id,
+            )
         )
-
-        # Transacción crédito
-        EmpresaTransaccion.objects.create(
-            asiento=asiento,
-            cuenta=cuenta_haber,
-            debe=Decimal("0.00"),
-            haber=monto,
-            tercero=tercero,
+        transacciones.append(
+            EmpresaTransaccion(
+                asiento_id=asiento.pk,
+                cuenta_id=cuenta_haber_id,
+                debe=ZERO,
+                haber=monto,
+                tercero_id=tercero_id,
+            )
         )
+    EmpresaTransaccion.objects.bulk_create(transacciones, batch_size=500)
 
-        if (i + 1) % 10 == 0:
-            print(f"  ✓ Generados {i+1}/60 asientos...")
+    print(f"  ✓ Generados {len(creados)} asientos y {len(transacciones)} transacciones")
 
     print("\n" + "=" * 60)
     print("  ✅ DATOS GENERADOS EXITOSAMENTE")
@@ -169,4 +239,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Abrir la conexión una vez; todo main() corre en una única transacción
+    connection.ensure_connection()
     main()